@@ -18,27 +18,22 @@ with open(init_file, 'r') as f:
         raise RuntimeError(
             'Cannot find __version__ in {}'.format(init_file))
 
-with open('README.rst', 'r') as f:
-    readme = f.read()
-
-with open('CHANGELOG.rst', 'r') as f:
-    changes = f.read()
-
 
 def parse_requirements(filename):
     ''' Load requirements from a pip requirements file '''
     with open(filename, 'r') as fd:
-        lines = []
-        for line in fd:
-            line.strip()
-            if line and not line.startswith("#"):
-                lines.append(line)
-    return lines
+        return [s for s in (raw.strip() for raw in fd) if s and not s.startswith("#")]
 
 
 requirements = parse_requirements('requirements.txt')
 
 if __name__ == '__main__':
+    with open('README.rst', 'r') as f:
+        readme = f.read()
+
+    with open('CHANGELOG.rst', 'r') as f:
+        changes = f.read()
+
     setup(
         name='getaltsclient',
         description='An asyncio client library for Telegram\'s GetAltsBot API: https://telegra.ph/GetAlts-API-06-09',
@@ -51,6 +46,7 @@ if __name__ == '__main__':
         maintainer='Joscha Götzer',
         maintainer_email='joscha.goetzer@gmail.com',
         install_requires=requirements,
+        extras_require={'fast': ['orjson']},
         keywords=['getaltsclient'],
         package_dir={'': 'src'},
         packages=find_packages('src'),
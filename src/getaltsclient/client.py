@@ -1,132 +1,42 @@
 import asyncio
+import functools
 import inspect
-import json
 import logging
 from asyncio import AbstractEventLoop
-from datetime import datetime
 from datetime import timedelta
 from enum import Enum
-from typing import Dict, Callable, Coroutine, Any
-
-import aiohttp
+from typing import TYPE_CHECKING, Dict, Callable, Coroutine, Any, Optional, List, Tuple
 
 try:
-    from dataclasses import dataclass
+    import orjson as _json
 except ImportError:
-    print("You need to either use Python 3.7 or pip install the 'dataclasses' package.")
-    import sys
-
-    sys.exit()
-
-
-class Service(Enum):
-    Microsoft = "ms"
-    Google = "go"
-    GMail = "gm"
-    Yahoo = "yh"
-    LinkedIN = "ln"
-    Uber = "ub"
-    WeChat = "wc"
-    Instagram = "ig"
-    LineMessenger = "lm"
-    Telegram = "tg"
-    VkCom = "vk"
-    YouTube = "yt"
-    Facebook = "fb"
-    Steam = "st"
-    Yandex = "ya"
-    Whatsapp = "wp"
-    Tinder = "ti"
-    Twitter = "tw"
-    AnyOther = "ot"
-
-
-class Country(Enum):
-    Russia = "ru"
-    Ukraine = "ua"
-    Kazakhstan = "kz"
-    China = "cn"
-    Philippines = "ph"
-    Myanmar = "mm"
-    Indonesia = "id"
-    Malaysia = "my"
-    Kenya = "ke"
-    Tanzania = "tz"
-    Vietnam = "vn"
-    Kyrgyzstan = "kg"
-    USA = "us"
-    Israel = "il"
-    HongKong = "hk"
-    Poland = "pl"
-    UnitedKingdom = "uk"
-    Madagascar = "mg"
-    Congo = "cg"
-    Nigeria = "ng"
-    Macau = "mo"
-    Egypt = "eg"
-    Ireland = "ie"
-    Cambodia = "kh"
-    Lao = "la"
-    Haiti = "ht"
-    IvoryCoast = "ci"
-    Gambia = "gm"
-    Serbian = "rs"
-    Yemen = "ye"
-    SouthAfrica = "za"
-    Romania = "ro"
-    Estonia = "ee"
-    Azerbaijan = "az"
-    Canada = "ca"
-    Morocco = "ma"
-    Ghana = "gh"
-    Argentina = "ar"
-    Uzbekistan = "uz"
-    Cameroon = "cm"
-    Chad = "tg"
-    Germany = "de"
-    Lithuania = "lt"
-    Croatia = "hr"
-    Iraq = "iq"
-    Netherlands = "nl"
-    India = "in"
-
-
-class Status(Enum):
-    """
-    Enumeration of statuses that GetAlts will provide depending on the current state of activation.
-    See https://telegra.ph/List-of-available-statuses-06-09
-    """
-
-    Ready = "READY"
-    AccessReady = "ACCESS_READY"
-    WaitingForCode = "STATUS_WAIT_CODE"
-    Cancelled = "ACCESS_CANCEL"
-    AccessConfirmGet = "ACCESS_CONFIRM_GET"
-    StatusOk = "STATUS_OK"
-
-
-class _Action(Enum):
-    SendSMS = "SMS_SENT"
-    Cancel = "CANCEL"
-    End = "END"
-    SendAnotherCode = "ONE_MORE_CODE"
-    AlreadyUsed = "ALREADY_USED"
-
-
-@dataclass(init=True, repr=True)
-class ActivationContext:
-    phone_number: str
-    activation_id: int
-    status: Status
-    code: int = None
-
-    @classmethod
-    def _from_dict(cls, data: Dict):
-        return ActivationContext(
-            phone_number=data["phone_number"],
-            activation_id=data["activation_id"],
-            status=Status(data["status"]),
-        )
+    import json as _json
+
+# The models are also re-exported here, so existing `getaltsclient.client` imports keep working
+from .models import (
+    ActivationContext,
+    Country,
+    Service,
+    Status,
+    _Action,
+    _COUNTRY_BY_VALUE,
+    _SERVICE_BY_VALUE,
+    _STATUS_BY_VALUE,
+)
+
+if TYPE_CHECKING:
+    import aiohttp
+
+__all__ = [
+    "ActivationContext",
+    "BatchWaiter",
+    "Country",
+    "GetAltsAPIError",
+    "GetAltsClient",
+    "NoCodeReceived",
+    "Service",
+    "Status",
+]
 
 
 class GetAltsAPIError(Exception):
@@ -137,18 +47,105 @@ class NoCodeReceived(Exception):
     pass
 
 
+_ENDPOINT_NAMES = (
+    "get_balance",
+    "get_amount",
+    "get_prices_by_country",
+    "get_prices_by_service",
+    "buy_number",
+    "get_activation_status",
+    "set_activation_status",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _endpoints_for(base_url: str) -> Dict[str, str]:
+    base_prefix = base_url + "/"
+    return {name: base_prefix + name for name in _ENDPOINT_NAMES}
+
+
 class GetAltsClient:
+    # Endpoint URLs are built once per distinct `base_url`, however it was set (subclass, class or instance)
     base_url = "http://getalts.club/api"
 
-    def __init__(self, token: str, loop: AbstractEventLoop = None, timeout: int = 10):
+    # Status polling starts fast and backs off exponentially up to `max_poll_delay` seconds
+    initial_poll_delay = 1.0
+    poll_backoff_factor = 1.7
+    max_poll_delay = 10.0
+
+    def __init__(
+        self,
+        token: str,
+        loop: AbstractEventLoop = None,
+        timeout: int = 10,
+        pool_size: int = 10,
+        keepalive_timeout: float = 75,
+    ):
+        """
+        :param pool_size: Maximum number of simultaneous connections to the GetAlts API.
+        :param keepalive_timeout: Seconds an idle connection is kept open for reuse. The default is well above
+            the polling interval of `register_code_received_callback`, so a single TCP connection is reused
+            for the whole `max_wait` window.
+        """
         self.token = token
         self.loop = loop or asyncio.get_event_loop()
+        # aiohttp is imported lazily so that importing the package and its models stays cheap
+        import aiohttp
+
         self.timeout = aiohttp.ClientTimeout(timeout)
         self.log = logging.getLogger(GetAltsClient.__name__)
         self.log.addHandler(logging.NullHandler())
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._inflight: Dict[int, asyncio.Future] = {}
+        self._closing = False
+        self._batch_supported = True
 
-    def _endpoint(self, name: str):
-        return f"{self.base_url}/{name}"
+    async def __aenter__(self) -> "GetAltsClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the underlying HTTP session and its connection pool. The client can still be used afterwards,
+        a new session will be created on the next request.
+        """
+        # Status requests that outlived all of their (cancelled) pollers would otherwise use a closed session.
+        # Pollers still waiting for them get a GetAltsAPIError instead of a CancelledError.
+        self._closing = True
+        try:
+            for pending in list(self._inflight.values()):
+                pending.cancel()
+            await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+        finally:
+            self._closing = False
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                timeout=self.timeout,
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=min(4, self.pool_size),
+                    keepalive_timeout=self.keepalive_timeout,
+                    use_dns_cache=True,
+                    ttl_dns_cache=600,
+                    enable_cleanup_closed=True,
+                ),
+            )
+        return self._session
+
+    def _endpoint(self, name: str) -> str:
+        return self.base_url + "/" + name
 
     async def get_balance(self) -> float:
         response = await self._get("get_balance")
@@ -156,15 +153,15 @@ class GetAltsClient:
 
     async def get_available_numbers_count(self, country: Country) -> Dict:
         response = await self._get("get_amount", dict(country=country.value))
-        return {Service(k): v for k, v in response.items()}
+        return self._map_keys(_SERVICE_BY_VALUE, response)
 
     async def get_prices_by_country(self, country: Country) -> Dict:
         response = await self._get("get_prices_by_country", dict(country=country.value))
-        return {Service(k): v for k, v in response.items()}
+        return self._map_keys(_SERVICE_BY_VALUE, response)
 
     async def get_prices_by_service(self, service: Service) -> Dict:
         response = await self._get("get_prices_by_service", dict(service=service.value))
-        return {Country(k): v for k, v in response.items()}
+        return self._map_keys(_COUNTRY_BY_VALUE, response)
 
     async def buy_number(self, service: Service, country: Country) -> ActivationContext:
         response = await self._get(
@@ -178,23 +175,31 @@ class GetAltsClient:
         for_context: ActivationContext,
         max_wait: timedelta = timedelta(minutes=1)
     ):
-        context = for_context
-        start = datetime.now()
-        while True:
-            if datetime.now() > start + max_wait:
-                raise NoCodeReceived
+        if not inspect.iscoroutinefunction(callback):
+            sync_callback = callback
+
+            async def callback(ctx: ActivationContext) -> None:
+                sync_callback(ctx)
 
+        try:
+            context = await asyncio.wait_for(
+                self._poll_until_code(for_context), timeout=max_wait.total_seconds()
+            )
+        except asyncio.TimeoutError:
+            raise NoCodeReceived
+
+        await callback(context)
+
+    async def _poll_until_code(self, context: ActivationContext) -> ActivationContext:
+        delay = self.initial_poll_delay
+        while True:
             self.log.info("Checking activation status for code...")
 
             context = await self.get_activation_status(context)
             if context.code is not None:
-                break
-            await asyncio.sleep(5)
-
-        if inspect.iscoroutinefunction(callback):
-            await callback(context)
-        else:
-            callback(context)
+                return context
+            await asyncio.sleep(delay)
+            delay = min(delay * self.poll_backoff_factor, self.max_poll_delay)
 
     async def _notify_code_received(self,
                                     callback: Callable[[ActivationContext], None],
@@ -205,11 +210,85 @@ class GetAltsClient:
     async def get_activation_status(
         self, activation_context: ActivationContext
     ) -> ActivationContext:
-        response = await self._get(
-            "get_activation_status",
-            dict(activation_id=activation_context.activation_id),
-        )
-        return self.__context_from_response(activation_context, response)
+        activation_id = activation_context.activation_id
+        pending = self._inflight.get(activation_id)
+        if pending is None:
+            # Concurrent pollers of the same activation share a single request
+            pending = self.loop.create_task(self._get_shared_status(activation_id))
+            self._inflight[activation_id] = pending
+            pending.add_done_callback(
+                functools.partial(self._on_status_request_done, activation_id)
+            )
+
+        # Shielded so that a cancelled poller does not abort the request for the others
+        response = await asyncio.shield(pending)
+        return self._context_from_response(activation_context, response)
+
+    async def _get_shared_status(self, activation_id: int) -> Dict:
+        try:
+            return await self._get("get_activation_status", dict(activation_id=activation_id))
+        except asyncio.CancelledError:
+            if self._closing:
+                raise GetAltsAPIError("Client closed") from None
+            raise
+
+    def _on_status_request_done(self, activation_id: int, task: asyncio.Future) -> None:
+        self._inflight.pop(activation_id, None)
+        if not task.cancelled():
+            # Retrieve the exception even if every poller has been cancelled in the meantime
+            task.exception()
+
+    async def get_activation_status_batch(
+        self, contexts: List[ActivationContext]
+    ) -> List[ActivationContext]:
+        """
+        Updates the status of several activations with a single request. If the API does not understand the
+        batched query, this falls back to one `get_activation_status` call per activation for the rest of the
+        client's lifetime.
+        """
+        if not contexts:
+            return contexts
+
+        if self._batch_supported:
+            from aiohttp import ClientResponseError
+
+            ids = list(dict.fromkeys(str(c.activation_id) for c in contexts))
+            try:
+                response = await self._get(
+                    "get_activation_status", dict(activation_ids=",".join(ids))
+                )
+            except ClientResponseError as e:
+                # Authentication failures and rate limits say nothing about the batched query itself
+                if e.status not in (400, 404, 422):
+                    raise
+                self.log.info("Batched status request was rejected: %s", e)
+                self._batch_supported = False
+            except GetAltsAPIError as e:
+                self.log.info("Batched status request failed: %s", e)
+                # The error may be unrelated to batching (e.g. an invalid token). Batching is only turned off
+                # if polling the same activations one by one works.
+                await asyncio.gather(*(self.get_activation_status(c) for c in contexts))
+                self._batch_supported = False
+                self.log.info(
+                    "Batched status requests are not supported, polling activations one by one."
+                )
+                return contexts
+            else:
+                if isinstance(response, dict) and all(
+                    isinstance(response.get(i), dict) for i in ids
+                ):
+                    for c in contexts:
+                        self._context_from_response(c, response[str(c.activation_id)])
+                    return contexts
+                self.log.info("Unexpected response to batched status request: %s", response)
+                self._batch_supported = False
+
+            self.log.info(
+                "Batched status requests are not supported, polling activations one by one."
+            )
+
+        await asyncio.gather(*(self.get_activation_status(c) for c in contexts))
+        return contexts
 
     async def _set_activation_status(
         self, activation_context: ActivationContext, new_status: _Action
@@ -221,7 +300,7 @@ class GetAltsClient:
                 status=new_status.value.lower(),  # TODO: This is a bug in the API, it should not be case sensitive.
             ),
         )
-        return self.__context_from_response(activation_context, response)
+        return self._context_from_response(activation_context, response)
 
     async def cancel_activation(self, activation_context: ActivationContext):
         """
@@ -252,30 +331,104 @@ class GetAltsClient:
             activation_context, _Action.AlreadyUsed
         )
 
+    def _map_keys(self, members_by_value: Dict[str, Enum], response: Dict) -> Dict:
+        try:
+            return {members_by_value[k]: v for k, v in response.items()}
+        except KeyError:
+            # Slow path, only taken when the API knows about services or countries that we don't
+            result = {}
+            for k, v in response.items():
+                member = members_by_value.get(k)
+                if member is None:
+                    self.log.warning("Skipping unknown code %r in API response.", k)
+                else:
+                    result[member] = v
+            return result
+
     @staticmethod
-    def __context_from_response(
+    def _context_from_response(
         old_context: ActivationContext, response: Dict
     ) -> ActivationContext:
-        old_context.status = Status(response["status"])
-        old_context.code = response.get("code", None)
+        old_context.status = _STATUS_BY_VALUE[response["status"]]
+        old_context.code = response.get("code")
         return old_context
 
     async def _get(self, endpoint: str, query_params: Dict = None) -> Dict:
         self.log.debug(
-            f"Making request to {endpoint} with parameters {query_params} ..."
+            "Making request to %s with parameters %s ...", endpoint, query_params
         )
-        params = query_params or dict()
-        params.update(token=self.token)
-
-        url = self._endpoint(endpoint)
-
-        async with aiohttp.ClientSession(
-            loop=self.loop, timeout=self.timeout
-        ) as session:  # type: aiohttp.ClientSession
-            async with session.get(url, params=params) as response:
-                response.raise_for_status()
-                result = json.loads(await response.text("utf-8"))
-                if "error" in result:
-                    raise GetAltsAPIError(result["error"])
-                self.log.debug(f"Received response: {result}")
-                return result
+        # A copy, so that the caller's dict is never modified
+        params = dict(query_params or {}, token=self.token)
+
+        url = _endpoints_for(self.base_url).get(endpoint) or self._endpoint(endpoint)
+
+        async with self._get_session().get(
+            url, params=params, raise_for_status=True
+        ) as response:
+            result = _json.loads(await response.read())
+            if "error" in result:
+                raise GetAltsAPIError(result["error"])
+            if self.log.isEnabledFor(logging.DEBUG):
+                self.log.debug("Received response: %s", result)
+            return result
+
+
+class BatchWaiter:
+    """
+    Waits for the codes of many activations at once. All registered activations are polled by a single
+    background task using `GetAltsClient.get_activation_status_batch`, instead of one polling loop each.
+    """
+
+    def __init__(self, client: GetAltsClient, poll_interval: float = 5):
+        self.client = client
+        self.poll_interval = poll_interval
+        self._waiters: List[Tuple[ActivationContext, asyncio.Future]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait_for_code(
+        self,
+        for_context: ActivationContext,
+        max_wait: timedelta = timedelta(minutes=1),
+    ) -> ActivationContext:
+        future = self.client.loop.create_future()
+        self._waiters.append((for_context, future))
+        if self._task is None:
+            self._task = self.client.loop.create_task(self._run())
+
+        try:
+            return await asyncio.wait_for(future, max_wait.total_seconds())
+        except asyncio.TimeoutError:
+            raise NoCodeReceived
+        finally:
+            # Stop polling once nobody is waiting anymore
+            if self._task is not None and all(f.done() for _, f in self._waiters):
+                self._task.cancel()
+                self._task = None
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                # Drop waiters that have been resolved or timed out in the meantime
+                self._waiters = [(c, f) for c, f in self._waiters if not f.done()]
+                if not self._waiters:
+                    break
+
+                polled = list(self._waiters)
+                self.client.log.info(
+                    "Checking activation status for %d activations...", len(polled)
+                )
+                try:
+                    await self.client.get_activation_status_batch([c for c, _ in polled])
+                except Exception:
+                    # Transient failures must not abort all waiters, each of them times out on its own
+                    self.client.log.exception("Checking activation status failed, retrying.")
+                else:
+                    for c, f in polled:
+                        if c.code is not None and not f.done():
+                            f.set_result(c)
+
+                if any(not f.done() for _, f in self._waiters):
+                    await asyncio.sleep(self.poll_interval)
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
@@ -0,0 +1,130 @@
+import sys
+from enum import Enum
+from typing import Dict
+
+try:
+    from dataclasses import dataclass
+except ImportError:
+    print("You need to either use Python 3.7 or pip install the 'dataclasses' package.")
+    sys.exit()
+
+# Slotted dataclasses are only supported from Python 3.10 on. Before that, `__slots__` cannot be combined with
+# field defaults, so older versions keep the regular `__dict__`-based instances.
+_SLOTS = dict(slots=True) if sys.version_info >= (3, 10) else {}
+
+
+class Service(Enum):
+    Microsoft = "ms"
+    Google = "go"
+    GMail = "gm"
+    Yahoo = "yh"
+    LinkedIN = "ln"
+    Uber = "ub"
+    WeChat = "wc"
+    Instagram = "ig"
+    LineMessenger = "lm"
+    Telegram = "tg"
+    VkCom = "vk"
+    YouTube = "yt"
+    Facebook = "fb"
+    Steam = "st"
+    Yandex = "ya"
+    Whatsapp = "wp"
+    Tinder = "ti"
+    Twitter = "tw"
+    AnyOther = "ot"
+
+
+class Country(Enum):
+    Russia = "ru"
+    Ukraine = "ua"
+    Kazakhstan = "kz"
+    China = "cn"
+    Philippines = "ph"
+    Myanmar = "mm"
+    Indonesia = "id"
+    Malaysia = "my"
+    Kenya = "ke"
+    Tanzania = "tz"
+    Vietnam = "vn"
+    Kyrgyzstan = "kg"
+    USA = "us"
+    Israel = "il"
+    HongKong = "hk"
+    Poland = "pl"
+    UnitedKingdom = "uk"
+    Madagascar = "mg"
+    Congo = "cg"
+    Nigeria = "ng"
+    Macau = "mo"
+    Egypt = "eg"
+    Ireland = "ie"
+    Cambodia = "kh"
+    Lao = "la"
+    Haiti = "ht"
+    IvoryCoast = "ci"
+    Gambia = "gm"
+    Serbian = "rs"
+    Yemen = "ye"
+    SouthAfrica = "za"
+    Romania = "ro"
+    Estonia = "ee"
+    Azerbaijan = "az"
+    Canada = "ca"
+    Morocco = "ma"
+    Ghana = "gh"
+    Argentina = "ar"
+    Uzbekistan = "uz"
+    Cameroon = "cm"
+    Chad = "tg"
+    Germany = "de"
+    Lithuania = "lt"
+    Croatia = "hr"
+    Iraq = "iq"
+    Netherlands = "nl"
+    India = "in"
+
+
+_SERVICE_BY_VALUE = Service._value2member_map_
+_COUNTRY_BY_VALUE = Country._value2member_map_
+
+
+class Status(Enum):
+    """
+    Enumeration of statuses that GetAlts will provide depending on the current state of activation.
+    See https://telegra.ph/List-of-available-statuses-06-09
+    """
+
+    Ready = "READY"
+    AccessReady = "ACCESS_READY"
+    WaitingForCode = "STATUS_WAIT_CODE"
+    Cancelled = "ACCESS_CANCEL"
+    AccessConfirmGet = "ACCESS_CONFIRM_GET"
+    StatusOk = "STATUS_OK"
+
+
+_STATUS_BY_VALUE = Status._value2member_map_
+
+
+class _Action(Enum):
+    SendSMS = "SMS_SENT"
+    Cancel = "CANCEL"
+    End = "END"
+    SendAnotherCode = "ONE_MORE_CODE"
+    AlreadyUsed = "ALREADY_USED"
+
+
+@dataclass(init=True, repr=True, **_SLOTS)
+class ActivationContext:
+    phone_number: str
+    activation_id: int
+    status: Status
+    code: int = None
+
+    @classmethod
+    def _from_dict(cls, data: Dict):
+        return ActivationContext(
+            phone_number=data["phone_number"],
+            activation_id=data["activation_id"],
+            status=_STATUS_BY_VALUE[data["status"]],
+        )
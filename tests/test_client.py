@@ -0,0 +1,273 @@
+import asyncio
+import unittest
+from unittest import mock
+from datetime import timedelta
+
+from aiohttp import ClientResponseError, web
+
+from getaltsclient.client import (
+    ActivationContext,
+    BatchWaiter,
+    Country,
+    GetAltsAPIError,
+    GetAltsClient,
+    NoCodeReceived,
+    Service,
+    Status,
+)
+
+
+class FakeGetAltsServer:
+    """
+    Minimal stand-in for the GetAlts API. Each test configures `status_handler` to control the responses of
+    the `get_activation_status` endpoint and inspects `requests` afterwards.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.status_handler = self.single_status
+        self.codes = {}
+        self.responses = {}
+        self._runner = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/api/get_activation_status", self._get_activation_status)
+        app.router.add_get("/api/{endpoint}", self._get_static_response)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/api"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    async def _get_activation_status(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        return await self.status_handler(request)
+
+    async def _get_static_response(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.query))
+        return web.json_response(self.responses[request.match_info["endpoint"]])
+
+    def status_of(self, activation_id: str) -> dict:
+        code = self.codes.get(activation_id)
+        if code is None:
+            return {"status": Status.WaitingForCode.value}
+        return {"status": Status.StatusOk.value, "code": code}
+
+    async def single_status(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(0.05)
+        return web.json_response(self.status_of(request.query.get("activation_id")))
+
+
+class GetAltsClientTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = FakeGetAltsServer()
+        base_url = await self.server.start()
+        client_class = type(
+            "TestClient",
+            (GetAltsClient,),
+            dict(base_url=base_url, initial_poll_delay=0.01, max_poll_delay=0.01),
+        )
+        self.client = client_class("token", loop=asyncio.get_running_loop())
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.stop()
+
+    @staticmethod
+    def context(activation_id: int) -> ActivationContext:
+        return ActivationContext("+100000000", activation_id, Status.Ready)
+
+
+class TestBaseUrl(GetAltsClientTestCase):
+    async def test_base_url_assigned_on_instance_is_used(self):
+        client = GetAltsClient("token", loop=asyncio.get_running_loop())
+        client.base_url = self.client.base_url
+        self.addAsyncCleanup(client.close)
+
+        await client.get_activation_status(self.context(1))
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(GetAltsClient.base_url, "http://getalts.club/api")
+
+    async def test_base_url_assigned_on_class_is_used(self):
+        with mock.patch.object(GetAltsClient, "base_url", self.client.base_url):
+            client = GetAltsClient("token", loop=asyncio.get_running_loop())
+            self.addAsyncCleanup(client.close)
+
+            await client.get_activation_status(self.context(1))
+
+        self.assertEqual(len(self.server.requests), 1)
+
+
+class TestRequests(GetAltsClientTestCase):
+    async def test_query_params_are_not_mutated(self):
+        params = dict(activation_id=1)
+
+        await self.client._get("get_activation_status", params)
+
+        self.assertEqual(params, dict(activation_id=1))
+        self.assertEqual(self.server.requests, [dict(activation_id="1", token="token")])
+
+
+class TestEnumMapping(GetAltsClientTestCase):
+    async def test_unknown_codes_are_skipped(self):
+        self.server.responses["get_amount"] = {"tg": 10, "xx": 3, "wp": 5}
+
+        with self.assertLogs(self.client.log, "WARNING") as logs:
+            result = await self.client.get_available_numbers_count(Country.USA)
+
+        self.assertEqual(result, {Service.Telegram: 10, Service.Whatsapp: 5})
+        self.assertIn("'xx'", logs.output[0])
+
+
+class TestStatusCoalescing(GetAltsClientTestCase):
+    async def test_concurrent_polls_share_one_request(self):
+        self.server.codes["1"] = 1234
+        contexts = [self.context(1) for _ in range(3)]
+
+        results = await asyncio.gather(
+            *(self.client.get_activation_status(c) for c in contexts)
+        )
+
+        self.assertEqual(len(self.server.requests), 1)
+        for context, result in zip(contexts, results):
+            self.assertIs(result, context)
+            self.assertEqual(result.code, 1234)
+        self.assertEqual(self.client._inflight, {})
+
+    async def test_different_activations_are_not_coalesced(self):
+        await asyncio.gather(
+            self.client.get_activation_status(self.context(1)),
+            self.client.get_activation_status(self.context(2)),
+        )
+
+        self.assertEqual(len(self.server.requests), 2)
+
+
+    async def test_close_fails_pollers_with_api_error(self):
+        release = asyncio.Event()
+
+        async def slow(request):
+            await release.wait()
+            return await self.server.single_status(request)
+
+        self.server.status_handler = slow
+        poller = asyncio.ensure_future(
+            self.client.register_code_received_callback(lambda context: None, self.context(1))
+        )
+        while not self.client._inflight:
+            await asyncio.sleep(0.01)
+
+        await self.client.close()
+
+        release.set()
+        with self.assertRaises(GetAltsAPIError):
+            await poller
+        self.assertFalse(poller.cancelled())
+
+
+class TestBatchFallback(GetAltsClientTestCase):
+    async def test_batched_response(self):
+        async def batched(request):
+            ids = request.query["activation_ids"].split(",")
+            return web.json_response({i: self.server.status_of(i) for i in ids})
+
+        self.server.status_handler = batched
+        self.server.codes["2"] = 42
+
+        contexts = await self.client.get_activation_status_batch(
+            [self.context(1), self.context(2)]
+        )
+
+        self.assertEqual([c.code for c in contexts], [None, 42])
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertTrue(self.client._batch_supported)
+
+    async def test_falls_back_on_client_error(self):
+        async def reject_batches(request):
+            if "activation_ids" in request.query:
+                return web.Response(status=400)
+            return await self.server.single_status(request)
+
+        self.server.status_handler = reject_batches
+        self.server.codes["1"] = 7
+
+        contexts = await self.client.get_activation_status_batch(
+            [self.context(1), self.context(2)]
+        )
+
+        self.assertEqual([c.code for c in contexts], [7, None])
+        self.assertFalse(self.client._batch_supported)
+
+    async def test_rate_limit_keeps_batching_enabled(self):
+        async def rate_limited(request):
+            return web.Response(status=429)
+
+        self.server.status_handler = rate_limited
+
+        with self.assertRaises(ClientResponseError):
+            await self.client.get_activation_status_batch([self.context(1)])
+        self.assertTrue(self.client._batch_supported)
+
+    async def test_falls_back_when_parameter_is_ignored(self):
+        self.server.codes["1"] = 7
+
+        contexts = await self.client.get_activation_status_batch(
+            [self.context(1), self.context(2)]
+        )
+
+        self.assertEqual([c.code for c in contexts], [7, None])
+        self.assertFalse(self.client._batch_supported)
+
+    async def test_unrelated_api_error_keeps_batching_enabled(self):
+        async def bad_token(request):
+            return web.json_response({"error": "BAD_TOKEN"})
+
+        self.server.status_handler = bad_token
+
+        with self.assertRaises(GetAltsAPIError):
+            await self.client.get_activation_status_batch([self.context(1)])
+        self.assertTrue(self.client._batch_supported)
+
+
+class TestWaiting(GetAltsClientTestCase):
+    async def test_register_code_received_callback_times_out(self):
+        with self.assertRaises(NoCodeReceived):
+            await self.client.register_code_received_callback(
+                lambda context: None, self.context(1), timedelta(seconds=0.2)
+            )
+
+    async def test_batch_waiter_times_out(self):
+        waiter = BatchWaiter(self.client, poll_interval=0.01)
+
+        with self.assertRaises(NoCodeReceived):
+            await waiter.wait_for_code(self.context(1), timedelta(seconds=0.2))
+
+    async def test_batch_waiter_survives_transient_errors(self):
+        failures = [1]
+
+        async def flaky(request):
+            if failures:
+                failures.pop()
+                return web.Response(status=500)
+            return await self.server.single_status(request)
+
+        self.server.status_handler = flaky
+        self.server.codes["1"] = 99
+        self.client._batch_supported = False
+        waiter = BatchWaiter(self.client, poll_interval=0.01)
+
+        with self.assertLogs(self.client.log, "ERROR"):
+            context = await waiter.wait_for_code(self.context(1), timedelta(seconds=2))
+
+        self.assertEqual(context.code, 99)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()